@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Upload NFLprops.json to Digital Ocean Spaces
+Upload the feed JSON files (e.g. NFLprops.json) to Digital Ocean Spaces
 This is an optional deployment script if you want to host the JSON file on Digital Ocean Spaces.
 
 Setup:
@@ -15,24 +15,86 @@ import sys
 import boto3
 from botocore.exceptions import ClientError
 
+from feeds import load_config
+
 # Configuration - Update these or use environment variables
 SPACE_NAME = os.getenv('DO_SPACE_NAME', 'your-space-name')
 SPACE_REGION = os.getenv('DO_SPACE_REGION', 'nyc3')  # e.g., nyc3, sfo3, sgp1
 ACCESS_KEY = os.getenv('DO_ACCESS_KEY', 'your-access-key')
 SECRET_KEY = os.getenv('DO_SECRET_KEY', 'your-secret-key')
 
-# File to upload
-LOCAL_FILE = 'NFLprops.json'
-REMOTE_FILE = 'NFLprops.json'
+# Files to upload come from the "spaces" outputs in feeds.json
+
+
+def create_client():
+    """Create an S3 client for Digital Ocean Spaces (S3-compatible API)."""
+    session = boto3.session.Session()
+    return session.client(
+        's3',
+        region_name=SPACE_REGION,
+        endpoint_url=f'https://{SPACE_REGION}.digitaloceanspaces.com',
+        aws_access_key_id=ACCESS_KEY,
+        aws_secret_access_key=SECRET_KEY
+    )
+
+
+def upload_file(client, local_file, remote_file, cache_seconds=3600):
+    """
+    Upload a single JSON file to the Space.
+    
+    Args:
+        client: S3 client from create_client()
+        local_file: Path of the JSON file to upload
+        remote_file: Object key in the Space
+        cache_seconds: Cache-Control max-age for the object
+    """
+    print(f"Uploading {local_file} to {SPACE_NAME}/{remote_file}...")
+    
+    # Upload file with public-read ACL and correct content type
+    client.upload_file(
+        local_file,
+        SPACE_NAME,
+        remote_file,
+        ExtraArgs={
+            'ACL': 'public-read',
+            'ContentType': 'application/json',
+            'CacheControl': f'max-age={cache_seconds}'
+        }
+    )
+
+
+def upload_feed(client, feed):
+    """Upload every spaces output of a feed."""
+    for output in feed['outputs']:
+        if output['type'] == 'spaces':
+            upload_file(client, output['path'], output['key'], output.get('cache_seconds', 3600))
 
 
 def upload_to_spaces():
-    """Upload the JSON file to Digital Ocean Spaces."""
+    """Upload the JSON file of every configured spaces output."""
     
-    # Check if file exists
-    if not os.path.exists(LOCAL_FILE):
-        print(f"Error: {LOCAL_FILE} not found!")
-        print("Run fetch_nfl_props.py first to generate the JSON file.")
+    try:
+        # Uploading local files never calls the upstream API, so no key is needed
+        config = load_config(require_api_key=False)
+    except (OSError, ValueError) as e:
+        print(f"Error: Invalid feed configuration: {e}")
+        sys.exit(1)
+    
+    outputs = [
+        output
+        for feed in config['feeds']
+        for output in feed['outputs']
+        if output['type'] == 'spaces'
+    ]
+    if not outputs:
+        print("No spaces outputs configured in feeds.json. Nothing to upload.")
+        return
+    
+    # Check if files exist
+    missing = [output['path'] for output in outputs if not os.path.exists(output['path'])]
+    if missing:
+        print(f"Error: {', '.join(missing)} not found!")
+        print("Run fetch_nfl_props.py first to generate the JSON files.")
         sys.exit(1)
     
     # Validate configuration
@@ -42,40 +104,20 @@ def upload_to_spaces():
         sys.exit(1)
     
     try:
-        # Create session
-        session = boto3.session.Session()
-        
-        # Create S3 client (Digital Ocean Spaces uses S3-compatible API)
-        client = session.client(
-            's3',
-            region_name=SPACE_REGION,
-            endpoint_url=f'https://{SPACE_REGION}.digitaloceanspaces.com',
-            aws_access_key_id=ACCESS_KEY,
-            aws_secret_access_key=SECRET_KEY
-        )
+        client = create_client()
         
-        print(f"Uploading {LOCAL_FILE} to {SPACE_NAME}/{REMOTE_FILE}...")
-        
-        # Upload file with public-read ACL and correct content type
-        client.upload_file(
-            LOCAL_FILE,
-            SPACE_NAME,
-            REMOTE_FILE,
-            ExtraArgs={
-                'ACL': 'public-read',
-                'ContentType': 'application/json',
-                'CacheControl': 'max-age=3600'  # Cache for 1 hour
-            }
-        )
-        
-        # Generate URLs
-        regular_url = f"https://{SPACE_NAME}.{SPACE_REGION}.digitaloceanspaces.com/{REMOTE_FILE}"
-        cdn_url = f"https://{SPACE_NAME}.{SPACE_REGION}.cdn.digitaloceanspaces.com/{REMOTE_FILE}"
+        for output in outputs:
+            upload_file(client, output['path'], output['key'], output.get('cache_seconds', 3600))
         
         print("\n✅ Upload successful!")
         print(f"\nAccess URLs:")
-        print(f"  Regular: {regular_url}")
-        print(f"  CDN:     {cdn_url}")
+        for output in outputs:
+            # Generate URLs
+            regular_url = f"https://{SPACE_NAME}.{SPACE_REGION}.digitaloceanspaces.com/{output['key']}"
+            cdn_url = f"https://{SPACE_NAME}.{SPACE_REGION}.cdn.digitaloceanspaces.com/{output['key']}"
+            print(f"  Regular: {regular_url}")
+            print(f"  CDN:     {cdn_url}")
+        
         print("\n💡 Use the CDN URL for better performance and global distribution.")
         
     except ClientError as e:
@@ -88,4 +130,3 @@ def upload_to_spaces():
 
 if __name__ == "__main__":
     upload_to_spaces()
-
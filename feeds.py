@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Feed engine for the props fetchers
+Loads feeds.json, fetches feeds over the shared HTTP session and writes their
+file outputs, and provides the rate limiting and freshness tracking used by
+fetch_nfl_props.py and worker.py.
+
+The optional top-level "status_file" is where worker.py writes per-feed
+freshness. Each feed is declared once in feeds.json:
+    name        Unique feed name (used in logs and the status file)
+    sport       Sport the feed belongs to (nfl, nba, ...)
+    report_id   Upstream reportid parameter
+    view        Upstream view parameter
+    interval_minutes       Minutes between successful updates
+    retry_minutes          Minutes to wait after a failed update
+    max_requests_per_hour  Per-feed cap on upstream requests
+    outputs     List of targets: {"type": "file", "path": ...} (at least one,
+                not shared with another feed) and optionally
+                {"type": "spaces", "key": ..., "cache_seconds": ...}
+"""
+
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Configuration
+CONFIG_FILE = os.getenv('FEEDS_CONFIG', 'feeds.json')
+
+DEFAULT_API_KEY_ENV = 'SDS_API_KEY'
+DEFAULT_INTERVAL_MINUTES = 60
+DEFAULT_RETRY_MINUTES = 5
+DEFAULT_MAX_REQUESTS_PER_HOUR = 6
+DEFAULT_MAX_REQUESTS_PER_MINUTE = 30
+DEFAULT_TIMEOUT_SECONDS = 30
+OUTPUT_TYPES = ('file', 'spaces')
+
+
+def load_config(path=CONFIG_FILE, require_api_key=True):
+    """
+    Load and validate the feed configuration.
+
+    Args:
+        path: Path to the JSON config file
+        require_api_key: Fail if the API key variable is unset. Callers that
+            never build an upstream URL (e.g. the Spaces uploader) pass False.
+
+    Returns:
+        Dictionary with 'api' settings and a list of 'feeds'
+
+    Raises:
+        ValueError: If the config has missing or invalid fields
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    if not isinstance(config, dict):
+        raise ValueError("Config must be a JSON object")
+
+    api = config.get('api', {})
+    if not isinstance(api, dict):
+        raise ValueError("Config 'api' section must be an object")
+    if not api.get('base_url'):
+        raise ValueError("Config 'api' section must set 'base_url'")
+
+    # The key is never committed; it comes from the environment only
+    if 'api_key' in api:
+        raise ValueError("Config must not contain 'api_key'; set the 'api_key_env' variable instead")
+    api.setdefault('api_key_env', DEFAULT_API_KEY_ENV)
+    api['api_key'] = os.getenv(api['api_key_env'])
+    if require_api_key and not api['api_key']:
+        raise ValueError(f"No API key: set the {api['api_key_env']} environment variable")
+    api.setdefault('max_requests_per_minute', DEFAULT_MAX_REQUESTS_PER_MINUTE)
+    api.setdefault('timeout_seconds', DEFAULT_TIMEOUT_SECONDS)
+    for field in ('max_requests_per_minute', 'timeout_seconds'):
+        _require_positive(api[field], f"Config 'api' field '{field}'")
+
+    feeds = config.get('feeds', [])
+    if not isinstance(feeds, list):
+        raise ValueError("Config 'feeds' must be a list")
+    if not feeds:
+        raise ValueError("Config must declare at least one feed")
+
+    names = set()
+    file_paths = {}
+    for feed in feeds:
+        if not isinstance(feed, dict):
+            raise ValueError(f"Feed entries must be objects, got {feed!r}")
+        for field in ('name', 'sport', 'report_id', 'view'):
+            if not feed.get(field):
+                raise ValueError(f"Feed {feed.get('name', '?')!r} is missing '{field}'")
+        if feed['name'] in names:
+            raise ValueError(f"Duplicate feed name {feed['name']!r}")
+        names.add(feed['name'])
+
+        feed.setdefault('interval_minutes', DEFAULT_INTERVAL_MINUTES)
+        feed.setdefault('retry_minutes', DEFAULT_RETRY_MINUTES)
+        feed.setdefault('max_requests_per_hour', DEFAULT_MAX_REQUESTS_PER_HOUR)
+        for field in ('interval_minutes', 'retry_minutes', 'max_requests_per_hour'):
+            _require_positive(feed[field], f"Feed {feed['name']!r} field '{field}'")
+
+        # A feed without outputs would be fetched, discarded and refetched every run
+        outputs = feed.get('outputs')
+        if not isinstance(outputs, list) or not outputs:
+            raise ValueError(f"Feed {feed['name']!r} 'outputs' must be a non-empty list")
+        for output in outputs:
+            if not isinstance(output, dict):
+                raise ValueError(f"Feed {feed['name']!r} outputs must be objects, got {output!r}")
+            if output.get('type') not in OUTPUT_TYPES:
+                raise ValueError(f"Feed {feed['name']!r} has unknown output type {output.get('type')!r}")
+            if output['type'] == 'file':
+                if not output.get('path'):
+                    raise ValueError(f"Feed {feed['name']!r} file output is missing 'path'")
+                # Feeds sharing a file would overwrite each other and share one mtime
+                owner = file_paths.setdefault(os.path.normpath(output['path']), feed['name'])
+                if owner != feed['name']:
+                    raise ValueError(f"Feeds {owner!r} and {feed['name']!r} both write {output['path']!r}")
+
+        own_paths = [output['path'] for output in outputs if output['type'] == 'file']
+        for output in outputs:
+            if output['type'] == 'spaces':
+                if not output.get('key'):
+                    raise ValueError(f"Feed {feed['name']!r} spaces output is missing 'key'")
+                # Spaces uploads the local copy written by one of the feed's file outputs
+                output.setdefault('path', own_paths[0] if own_paths else None)
+                if output['path'] not in own_paths:
+                    raise ValueError(f"Feed {feed['name']!r} spaces output must upload one of its file outputs")
+                if 'cache_seconds' in output:
+                    _require_positive(output['cache_seconds'], f"Feed {feed['name']!r} field 'cache_seconds'")
+
+    return {'api': api, 'feeds': feeds, 'status_file': config.get('status_file')}
+
+
+def _require_positive(value, label):
+    """Raise ValueError unless value is a positive number."""
+    # bool is an int subclass, but "true" is never a sensible rate or interval
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValueError(f"{label} must be a positive number, got {value!r}")
+
+
+def select_feeds(config, names=None):
+    """
+    Return the configured feeds, optionally limited to the given names.
+
+    Raises:
+        ValueError: If a requested feed name is not configured
+    """
+    if not names:
+        return config['feeds']
+
+    by_name = {feed['name']: feed for feed in config['feeds']}
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown feed(s): {', '.join(unknown)}")
+    return [by_name[name] for name in names]
+
+
+def feed_file_path(feed):
+    """Return the path of the feed's first file output, or None."""
+    for output in feed.get('outputs', []):
+        if output.get('type') == 'file':
+            return output['path']
+    return None
+
+
+def build_url(api, feed):
+    """Build the upstream API URL for a feed."""
+    if not api.get('api_key'):
+        raise ValueError(f"No API key: set the {api['api_key_env']} environment variable")
+    query = urlencode({
+        'reportid': feed['report_id'],
+        'view': feed['view'],
+        'apikey': api['api_key'],
+    })
+    return f"{api['base_url']}?{query}"
+
+
+def create_session(pool_size=4):
+    """
+    Create the HTTP session shared by every feed.
+
+    Reusing one session keeps connections to the upstream host alive
+    between fetches instead of opening a new one per request.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def fetch_data(url, session=None, timeout=30):
+    """
+    Fetch data from the API endpoint.
+
+    Args:
+        url: API endpoint URL
+        session: Optional shared requests.Session to reuse connections
+        timeout: Request timeout in seconds
+
+    Returns:
+        Python dictionary (JSON data)
+    """
+    print(f"Fetching data from API...")
+    try:
+        response = (session or requests).get(url, timeout=timeout)
+        response.raise_for_status()
+
+        # Try to parse as JSON first
+        try:
+            data = response.json()
+            print(f"Data fetched successfully. ({len(data)} records)")
+            return data
+        except json.JSONDecodeError:
+            # If JSON parsing fails, return as text for potential XML parsing
+            print("Data fetched successfully.")
+            return response.text
+
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching data: {e}")
+        raise
+
+
+def save_json(data, file_path):
+    """
+    Save data as formatted JSON file.
+
+    Args:
+        data: Python dictionary to save
+        file_path: Output file path
+    """
+    print(f"Saving data to '{file_path}'...")
+    try:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        print(f"Data saved successfully to '{file_path}'")
+    except Exception as e:
+        print(f"Error saving JSON file: {e}")
+        raise
+
+
+def update_feed(feed, api, session=None):
+    """
+    Fetch a feed and write it to each of its file outputs.
+
+    Args:
+        feed: Feed entry from feeds.json
+        api: 'api' section from feeds.json
+        session: Optional shared requests.Session
+
+    Returns:
+        The fetched data
+    """
+    print(f"\n[{feed['name']}] {feed['sport']} {feed['report_id']}/{feed['view']}")
+    data = fetch_data(build_url(api, feed), session, api['timeout_seconds'])
+
+    for output in feed['outputs']:
+        if output['type'] == 'file':
+            save_json(data, output['path'])
+
+    return data
+
+
+class RateLimiter:
+    """Sliding-window limiter allowing max_calls per period_seconds."""
+
+    def __init__(self, max_calls, period_seconds):
+        self.max_calls = max_calls
+        self.period_seconds = period_seconds
+        self.calls = deque()
+
+    def _expire(self, now):
+        while self.calls and now - self.calls[0] >= self.period_seconds:
+            self.calls.popleft()
+
+    def wait_time(self, now=None):
+        """Seconds until another call is allowed (0 if allowed now)."""
+        now = time.time() if now is None else now
+        self._expire(now)
+        if len(self.calls) < self.max_calls:
+            return 0
+        return self.calls[0] + self.period_seconds - now
+
+    def record(self, now=None):
+        """Record a call made at the given time."""
+        now = time.time() if now is None else now
+        self._expire(now)
+        self.calls.append(now)
+
+
+class FeedState:
+    """
+    Freshness tracking for a single feed.
+
+    Spaces uploads are only tracked when uploads_enabled is True (i.e. the
+    worker has a Spaces client); otherwise they are reported as disabled.
+    """
+
+    def __init__(self, feed, uploads_enabled=True):
+        self.feed = feed
+        self.limiter = RateLimiter(feed['max_requests_per_hour'], 3600)
+        self.last_attempt = None
+        self.last_success = None
+        self.last_error = None
+        self.records = None
+        self.consecutive_failures = 0
+
+        # Spaces uploads are tracked separately so a failed upload is retried
+        # without refetching and the status file shows a stale public copy
+        self.has_spaces = any(output['type'] == 'spaces' for output in feed['outputs'])
+        self.uploads_enabled = uploads_enabled and self.has_spaces
+        self.upload_pending = False
+        self.last_upload = None
+        self.last_upload_attempt = None
+        self.upload_error = None
+
+        # Pick up where a previous run left off so restarts don't refetch,
+        # but re-upload since we can't tell whether the last upload succeeded
+        path = feed_file_path(feed)
+        if path and os.path.exists(path):
+            self.last_success = os.path.getmtime(path)
+            self.upload_pending = self.uploads_enabled
+
+    def next_due(self):
+        """Timestamp at which the feed should next be fetched."""
+        if self.last_attempt is None and self.last_success is None:
+            return 0
+        if self.consecutive_failures:
+            return self.last_attempt + self.feed['retry_minutes'] * 60
+        return self.last_success + self.feed['interval_minutes'] * 60
+
+    def upload_due(self):
+        """Timestamp at which outputs should next be uploaded, or None."""
+        if not self.upload_pending:
+            return None
+        if self.upload_error is None:
+            return 0
+        return self.last_upload_attempt + self.feed['retry_minutes'] * 60
+
+    def mark_success(self, data, now=None):
+        now = time.time() if now is None else now
+        self.last_attempt = now
+        self.last_success = now
+        self.last_error = None
+        # Text fallbacks (non-JSON bodies) have no meaningful record count
+        self.records = len(data) if isinstance(data, (list, dict)) else None
+        self.consecutive_failures = 0
+        self.upload_pending = self.uploads_enabled
+        self.upload_error = None
+
+    def mark_failure(self, error, now=None):
+        now = time.time() if now is None else now
+        self.last_attempt = now
+        self.last_error = str(error)
+        self.consecutive_failures += 1
+
+    def mark_uploaded(self, now=None):
+        now = time.time() if now is None else now
+        self.last_upload = now
+        self.last_upload_attempt = now
+        self.upload_pending = False
+        self.upload_error = None
+
+    def mark_upload_failure(self, error, now=None):
+        now = time.time() if now is None else now
+        self.last_upload_attempt = now
+        self.upload_error = str(error)
+
+    def to_dict(self, now=None):
+        """Status summary for logging and the status file."""
+        now = time.time() if now is None else now
+
+        def iso(timestamp):
+            return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+        age = int(now - self.last_success) if self.last_success else None
+        status = {
+            'sport': self.feed['sport'],
+            'last_success': iso(self.last_success),
+            'last_attempt': iso(self.last_attempt),
+            'age_seconds': age,
+            'is_fresh': age is not None and age < self.feed['interval_minutes'] * 60,
+            'next_due': iso(max(self.next_due(), now)),
+            'records': self.records,
+            'consecutive_failures': self.consecutive_failures,
+            'last_error': self.last_error,
+        }
+        if self.has_spaces and not self.uploads_enabled:
+            status['upload'] = {'enabled': False}
+        elif self.has_spaces:
+            upload_due = self.upload_due()
+            status['upload'] = {
+                'enabled': True,
+                'last_upload': iso(self.last_upload),
+                'last_attempt': iso(self.last_upload_attempt),
+                'is_current': not self.upload_pending,
+                'next_retry': iso(upload_due) if upload_due else None,
+                'last_error': self.upload_error,
+            }
+        return status
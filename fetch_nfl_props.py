@@ -1,20 +1,25 @@
 #!/usr/bin/env python3
 """
 NFL Props Data Fetcher
-Fetches data from API and saves to NFLprops.json
-Only updates once per hour to minimize API calls.
+Fetches every feed declared in feeds.json once and saves its file outputs.
+Feeds whose output is still fresh are skipped to minimize API calls.
+
+Requests are spaced by the max_requests_per_minute limit shared across the
+API key. Each run makes at most one request per feed, so between runs the
+per-feed cadence comes from interval_minutes; the per-feed
+max_requests_per_hour cap is enforced only by the long-running worker.py.
+
+Usage:
+    python3 fetch_nfl_props.py                     # all configured feeds
+    python3 fetch_nfl_props.py nfl-passingyards    # only the named feed(s)
 """
 
-import json
 import os
+import sys
 import time
 from datetime import datetime, timedelta
-import requests
 
-# Configuration
-API_URL = "https://xml.sportsdatasolutions.com/api/v2/?reportid=nflprojections&view=passingyards&apikey=gBCLfS2nw68j38874HJrgscQtG9znGWEP4bW"
-OUTPUT_FILE = "NFLprops.json"
-UPDATE_INTERVAL_HOURS = 1
+from feeds import RateLimiter, create_session, feed_file_path, load_config, select_feeds, update_feed
 
 
 def should_update(file_path, interval_hours=1):
@@ -47,54 +52,6 @@ def should_update(file_path, interval_hours=1):
         return False
 
 
-def fetch_data(url):
-    """
-    Fetch data from the API endpoint.
-    
-    Args:
-        url: API endpoint URL
-    
-    Returns:
-        Python dictionary (JSON data)
-    """
-    print(f"Fetching data from API...")
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        
-        # Try to parse as JSON first
-        try:
-            data = response.json()
-            print(f"Data fetched successfully. ({len(data)} records)")
-            return data
-        except json.JSONDecodeError:
-            # If JSON parsing fails, return as text for potential XML parsing
-            print("Data fetched successfully.")
-            return response.text
-            
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching data: {e}")
-        raise
-
-
-def save_json(data, file_path):
-    """
-    Save data as formatted JSON file.
-    
-    Args:
-        data: Python dictionary to save
-        file_path: Output file path
-    """
-    print(f"Saving data to '{file_path}'...")
-    try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"Data saved successfully to '{file_path}'")
-    except Exception as e:
-        print(f"Error saving JSON file: {e}")
-        raise
-
-
 def main():
     """Main execution function."""
     print("=" * 60)
@@ -102,27 +59,45 @@ def main():
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 60)
     
-    # Check if update is needed
-    if not should_update(OUTPUT_FILE, UPDATE_INTERVAL_HOURS):
-        print("\nNo update needed. Exiting.")
-        return
-    
     try:
-        # Fetch data from API
-        data = fetch_data(API_URL)
-        
-        # Save to file
-        save_json(data, OUTPUT_FILE)
+        config = load_config()
+        feeds = select_feeds(config, sys.argv[1:])
+    except (OSError, ValueError) as e:
+        print(f"\nInvalid feed configuration: {e}")
+        exit(1)
+    
+    session = create_session()
+    key_limiter = RateLimiter(config['api']['max_requests_per_minute'], 60)
+    failed = []
+    
+    for feed in feeds:
+        # Check if update is needed
+        path = feed_file_path(feed)
+        if path and not should_update(path, feed['interval_minutes'] / 60):
+            print(f"[{feed['name']}] No update needed.")
+            continue
         
-        print("\n" + "=" * 60)
-        print("Update completed successfully!")
-        print("=" * 60)
+        # Stay under the request limit shared by every feed on the API key
+        wait = key_limiter.wait_time()
+        if wait > 0:
+            print(f"API key rate limit reached. Waiting {int(wait)} seconds...")
+            time.sleep(wait)
+        key_limiter.record()
         
-    except Exception as e:
-        print(f"\nFailed to update data: {e}")
+        try:
+            update_feed(feed, config['api'], session)
+        except Exception as e:
+            print(f"\n[{feed['name']}] Failed to update data: {e}")
+            failed.append(feed['name'])
+    
+    if failed:
+        print(f"\nFailed feeds: {', '.join(failed)}")
         exit(1)
+    
+    print("\n" + "=" * 60)
+    print("Update completed successfully!")
+    print("=" * 60)
 
 
 if __name__ == "__main__":
     main()
-
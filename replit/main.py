@@ -1,13 +1,23 @@
 from flask import Flask, jsonify
 import requests
 import os
+import sys
 from datetime import datetime, timedelta
 import threading
 import time
 import json
 
+# feeds.py and feeds.json live at the repo root; in a Repl they are uploaded
+# next to this file, which takes precedence
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(HERE))
+from feeds import build_url, load_config, select_feeds
+
 app = Flask(__name__)
 
+# Feed to serve from feeds.json (defaults to the first configured feed)
+FEED_NAME = os.environ.get('NFL_FEED')
+
 # In-memory cache for NFL props data
 cache = {
     'data': None,
@@ -17,16 +27,38 @@ cache = {
 
 CACHE_DURATION = 3600  # 1 hour in seconds
 
+def find_config():
+    """Locate feeds.json: FEEDS_CONFIG, next to main.py, then the repo root"""
+    if os.environ.get('FEEDS_CONFIG'):
+        return os.environ['FEEDS_CONFIG']
+    local = os.path.join(HERE, 'feeds.json')
+    if os.path.exists(local):
+        return local
+    return os.path.join(os.path.dirname(HERE), 'feeds.json')
+
+
+def get_api_url():
+    """
+    Build the API URL from the feed in feeds.json
+    The API key is stored as Replit Secret SDS_API_KEY (completely hidden)
+    """
+    try:
+        config = load_config(find_config())
+        feed = select_feeds(config, [FEED_NAME] if FEED_NAME else None)[0]
+        return build_url(config['api'], feed)
+    except (OSError, ValueError) as e:
+        print(f"❌ ERROR: {e}")
+        print("   Upload feeds.json and add SDS_API_KEY in Secrets (🔒)")
+        return None
+
+
 def fetch_nfl_data():
     """
     Fetch NFL props data from XML API
-    API URL is stored as Replit Secret (completely hidden)
     """
-    api_url = os.environ.get('NFL_API_URL')
+    api_url = get_api_url()
     
     if not api_url:
-        print("❌ ERROR: NFL_API_URL not set in Replit Secrets")
-        print("   Go to Secrets (🔒) and add: NFL_API_URL")
         return None
     
     try:
@@ -338,8 +370,8 @@ if __name__ == '__main__':
     print("="*60 + "\n")
     
     # Check if API URL is configured
-    if not os.environ.get('NFL_API_URL'):
-        print("⚠️  WARNING: NFL_API_URL not found in Secrets!")
+    if not os.environ.get('SDS_API_KEY'):
+        print("⚠️  WARNING: SDS_API_KEY not found in Secrets!")
         print("   Please add it in Replit Secrets (🔒 icon)\n")
     
     # Start background updater thread (daemon=True means it stops when main program stops)
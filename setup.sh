@@ -33,13 +33,14 @@ echo "======================================"
 echo ""
 echo "Next steps:"
 echo ""
-echo "1. Run the script manually:"
+echo "1. Set your API key and run the script manually:"
+echo "   export SDS_API_KEY='your-api-key'"
 echo "   python3 fetch_nfl_props.py"
 echo ""
 echo "2. Set up automatic updates (cron job):"
 echo "   crontab -e"
-echo "   Then add:"
-echo "   0 * * * * cd $(pwd) && python3 fetch_nfl_props.py >> nfl_props.log 2>&1"
+echo "   Then add (cron doesn't inherit your shell's exports):"
+echo "   0 * * * * cd $(pwd) && SDS_API_KEY=your-api-key python3 fetch_nfl_props.py >> nfl_props.log 2>&1"
 echo ""
 echo "3. View example frontend:"
 echo "   Open example.html in a web browser"
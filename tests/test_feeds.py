@@ -0,0 +1,208 @@
+import json
+
+import pytest
+
+import feeds
+from feeds import FeedState, RateLimiter, load_config, select_feeds
+
+
+def make_feed(**overrides):
+    feed = {
+        'name': 'nfl-passingyards',
+        'sport': 'nfl',
+        'report_id': 'nflprojections',
+        'view': 'passingyards',
+        'interval_minutes': 60,
+        'retry_minutes': 5,
+        'max_requests_per_hour': 6,
+        'outputs': [{'type': 'file', 'path': 'NFLprops.json'}],
+    }
+    feed.update(overrides)
+    return feed
+
+
+@pytest.fixture
+def write_config(tmp_path, monkeypatch):
+    monkeypatch.setenv('SDS_API_KEY', 'test-key')
+
+    def write(config=None, **api):
+        if config is None:
+            config = {'feeds': [make_feed()]}
+        config.setdefault('api', {'base_url': 'https://example.com/api/', **api})
+        path = tmp_path / 'feeds.json'
+        path.write_text(json.dumps(config))
+        return str(path)
+
+    return write
+
+
+# RateLimiter
+
+def test_rate_limiter_waits_until_oldest_call_expires():
+    limiter = RateLimiter(2, 60)
+    limiter.record(now=100)
+    assert limiter.wait_time(now=100) == 0
+    limiter.record(now=110)
+    assert limiter.wait_time(now=120) == 40
+
+
+def test_rate_limiter_sliding_window_expires_old_calls():
+    limiter = RateLimiter(2, 60)
+    limiter.record(now=100)
+    limiter.record(now=110)
+    assert limiter.wait_time(now=160) == 0
+    limiter.record(now=160)
+    assert list(limiter.calls) == [110, 160]
+    assert limiter.wait_time(now=165) == 5
+
+
+# FeedState scheduling
+
+def test_next_due_is_immediate_for_a_new_feed():
+    assert FeedState(make_feed()).next_due() == 0
+
+
+def test_next_due_switches_between_retry_and_interval():
+    state = FeedState(make_feed())
+
+    state.mark_success([{}], now=1000)
+    assert state.next_due() == 1000 + 60 * 60
+
+    state.mark_failure(RuntimeError('timeout'), now=2000)
+    assert state.next_due() == 2000 + 5 * 60
+    assert state.consecutive_failures == 1
+
+    state.mark_failure(RuntimeError('timeout'), now=2300)
+    assert state.next_due() == 2300 + 5 * 60
+    assert state.consecutive_failures == 2
+
+    state.mark_success([{}], now=2600)
+    assert state.next_due() == 2600 + 60 * 60
+    assert state.consecutive_failures == 0
+    assert state.last_error is None
+
+
+def test_records_counted_only_for_json_payloads():
+    state = FeedState(make_feed())
+    state.mark_success([{}, {}], now=1000)
+    assert state.records == 2
+    state.mark_success('<xml>not json</xml>', now=2000)
+    assert state.records is None
+
+
+def test_upload_retries_on_retry_minutes(tmp_path):
+    feed = make_feed(outputs=[
+        {'type': 'file', 'path': str(tmp_path / 'missing.json')},
+        {'type': 'spaces', 'key': 'NFLprops.json', 'path': str(tmp_path / 'missing.json')},
+    ])
+    state = FeedState(feed)
+    assert state.upload_due() is None
+
+    state.mark_success([{}], now=1000)
+    assert state.upload_due() == 0
+    assert state.to_dict(now=1000)['upload']['is_current'] is False
+
+    state.mark_upload_failure(RuntimeError('denied'), now=1001)
+    assert state.upload_due() == 1001 + 5 * 60
+
+    state.mark_uploaded(now=1400)
+    assert state.upload_due() is None
+    assert state.to_dict(now=1400)['upload']['is_current'] is True
+
+
+def test_uploads_disabled_without_spaces_client(tmp_path):
+    path = tmp_path / 'NFLprops.json'
+    path.write_text('[]')
+    feed = make_feed(outputs=[
+        {'type': 'file', 'path': str(path)},
+        {'type': 'spaces', 'key': 'NFLprops.json', 'path': str(path)},
+    ])
+    state = FeedState(feed, uploads_enabled=False)
+    assert state.upload_due() is None
+
+    state.mark_success([{}], now=1000)
+    assert state.upload_due() is None
+    assert state.to_dict(now=1000)['upload'] == {'enabled': False}
+
+
+def test_restart_reuploads_existing_file(tmp_path):
+    path = tmp_path / 'NFLprops.json'
+    path.write_text('[]')
+    feed = make_feed(outputs=[
+        {'type': 'file', 'path': str(path)},
+        {'type': 'spaces', 'key': 'NFLprops.json', 'path': str(path)},
+    ])
+    state = FeedState(feed)
+    assert state.next_due() > 0
+    assert state.upload_due() == 0
+
+
+# load_config / select_feeds
+
+def test_load_config_applies_defaults_and_env_key(write_config):
+    config = load_config(write_config({'feeds': [{
+        'name': 'nfl-passingyards', 'sport': 'nfl', 'report_id': 'r', 'view': 'v',
+        'outputs': [{'type': 'file', 'path': 'NFLprops.json'}, {'type': 'spaces', 'key': 'NFLprops.json'}],
+    }]}))
+    feed = config['feeds'][0]
+    assert config['api']['api_key'] == 'test-key'
+    assert feed['interval_minutes'] == feeds.DEFAULT_INTERVAL_MINUTES
+    assert feed['outputs'][1]['path'] == 'NFLprops.json'
+
+
+@pytest.mark.parametrize('config, message', [
+    ({'feeds': {'nfl': make_feed()}}, "'feeds' must be a list"),
+    ({'feeds': []}, 'at least one feed'),
+    ({'feeds': [make_feed(), make_feed()]}, 'Duplicate feed name'),
+    ({'feeds': [make_feed(view='')]}, "missing 'view'"),
+    ({'feeds': [make_feed(max_requests_per_hour=0)]}, "'max_requests_per_hour' must be a positive number"),
+    ({'feeds': [make_feed(max_requests_per_hour='6')]}, "'max_requests_per_hour' must be a positive number"),
+    ({'feeds': [make_feed(interval_minutes=-1)]}, "'interval_minutes' must be a positive number"),
+    ({'feeds': [make_feed(retry_minutes=True)]}, "'retry_minutes' must be a positive number"),
+    ({'feeds': [make_feed(outputs=[{'type': 'ftp'}])]}, 'unknown output type'),
+    ({'feeds': [make_feed(outputs=[])]}, "'outputs' must be a non-empty list"),
+    ({'feeds': [make_feed(outputs=[{'type': 'spaces', 'key': 'x.json'}])]}, 'must upload one of its file outputs'),
+    ({'feeds': [make_feed(outputs=[
+        {'type': 'file', 'path': 'a.json'},
+        {'type': 'spaces', 'key': 'a.json', 'path': 'b.json'},
+    ])]}, 'must upload one of its file outputs'),
+    ({'feeds': [make_feed(), make_feed(name='nfl-rushingyards', view='rushingyards')]}, 'both write'),
+])
+def test_load_config_rejects_bad_feeds(write_config, config, message):
+    with pytest.raises(ValueError, match=message):
+        load_config(write_config(config))
+
+
+def test_load_config_rejects_bad_api_limits(write_config):
+    with pytest.raises(ValueError, match="'max_requests_per_minute' must be a positive number"):
+        load_config(write_config(max_requests_per_minute=0))
+
+
+def test_load_config_requires_env_key(write_config, monkeypatch):
+    path = write_config()
+    monkeypatch.delenv('SDS_API_KEY')
+    with pytest.raises(ValueError, match='SDS_API_KEY'):
+        load_config(path)
+
+
+def test_load_config_rejects_literal_key(write_config):
+    with pytest.raises(ValueError, match="must not contain 'api_key'"):
+        load_config(write_config(api_key='secret'))
+
+
+def test_load_config_without_key_for_uploads(write_config, monkeypatch):
+    path = write_config()
+    monkeypatch.delenv('SDS_API_KEY')
+    config = load_config(path, require_api_key=False)
+    assert config['api']['api_key'] is None
+    with pytest.raises(ValueError, match='SDS_API_KEY'):
+        feeds.build_url(config['api'], config['feeds'][0])
+
+
+def test_select_feeds_rejects_unknown_names(write_config):
+    config = load_config(write_config())
+    assert select_feeds(config) == config['feeds']
+    assert select_feeds(config, ['nfl-passingyards']) == config['feeds']
+    with pytest.raises(ValueError, match='Unknown feed.*nba-points'):
+        select_feeds(config, ['nfl-passingyards', 'nba-points'])
+
@@ -1,77 +1,154 @@
 #!/usr/bin/env python3
 """
 Continuous worker for Digital Ocean App Platform
-Runs the fetch script every hour in a loop
+Schedules every feed declared in feeds.json from a single process.
+
+All feeds share one HTTP session (and one Spaces client), each feed is
+fetched on its own cadence, and upstream requests are rate limited both
+per feed and across the shared API key.
+
+Usage:
+    python3 worker.py                     # all configured feeds
+    python3 worker.py nfl-passingyards    # only the named feed(s)
 """
 
+import json
+import os
 import time
-import subprocess
 import sys
 from datetime import datetime
 
-def run_fetch_script():
-    """Run the fetch script."""
+from deploy_to_spaces import create_client, upload_feed
+from feeds import FeedState, RateLimiter, create_session, load_config, select_feeds, update_feed
+
+
+def create_spaces_client(feeds):
+    """Return a Spaces client if any feed uploads and credentials are set."""
+    if not any(output['type'] == 'spaces' for feed in feeds for output in feed['outputs']):
+        return None
+
+    if not all([
+        os.getenv('DO_SPACE_NAME'),
+        os.getenv('DO_ACCESS_KEY'),
+        os.getenv('DO_SECRET_KEY')
+    ]):
+        print("Spaces credentials not set. Spaces outputs will be skipped.")
+        return None
+
+    return create_client()
+
+
+def run_feed(state, api, session):
+    """Fetch one feed, write its file outputs and update its freshness state."""
     try:
         print(f"\n{'='*60}")
         print(f"Running fetch at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'='*60}")
-        
-        result = subprocess.run(
-            ['python3', 'fetch_nfl_props.py'],
-            capture_output=True,
-            text=True
-        )
-        
-        print(result.stdout)
-        if result.stderr:
-            print("STDERR:", result.stderr, file=sys.stderr)
-        
-        if result.returncode == 0:
-            print("✓ Fetch completed successfully")
-            
-            # Optional: Upload to Digital Ocean Spaces if credentials are set
-            import os
-            if all([
-                os.getenv('DO_SPACE_NAME'),
-                os.getenv('DO_ACCESS_KEY'),
-                os.getenv('DO_SECRET_KEY')
-            ]):
-                print("\nUploading to Digital Ocean Spaces...")
-                upload_result = subprocess.run(
-                    ['python3', 'deploy_to_spaces.py'],
-                    capture_output=True,
-                    text=True
-                )
-                print(upload_result.stdout)
-                if upload_result.returncode == 0:
-                    print("✓ Upload completed successfully")
-                else:
-                    print("✗ Upload failed", file=sys.stderr)
-            
-            return True
-        else:
-            print(f"✗ Fetch failed with exit code {result.returncode}", file=sys.stderr)
-            return False
-        
+
+        data = update_feed(state.feed, api, session)
+        state.mark_success(data)
+        print(f"✓ [{state.feed['name']}] Fetch completed successfully")
+        return True
+
     except Exception as e:
-        print(f"Error running fetch script: {e}", file=sys.stderr)
+        state.mark_failure(e)
+        print(f"✗ [{state.feed['name']}] Fetch failed: {e}", file=sys.stderr)
         return False
 
 
+def run_upload(state, spaces_client):
+    """Upload a feed's spaces outputs, retrying on retry_minutes if it fails."""
+    try:
+        print(f"\n[{state.feed['name']}] Uploading to Digital Ocean Spaces...")
+        upload_feed(spaces_client, state.feed)
+        state.mark_uploaded()
+        print("✓ Upload completed successfully")
+        return True
+
+    except Exception as e:
+        state.mark_upload_failure(e)
+        print(f"✗ [{state.feed['name']}] Upload failed: {e} "
+              f"(retrying in {state.feed['retry_minutes']} min)", file=sys.stderr)
+        return False
+
+
+def write_status(states, path):
+    """Write per-feed freshness to the status file."""
+    if not path:
+        return
+
+    status = {
+        'updated_at': datetime.now().isoformat(),
+        'feeds': {state.feed['name']: state.to_dict() for state in states}
+    }
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(status, f, indent=2)
+    except OSError as e:
+        print(f"Error writing status file: {e}", file=sys.stderr)
+
+
 def main():
     """Main worker loop."""
-    print("NFL Props Worker Started")
-    print("Will fetch data every hour")
+    config = load_config()
+    feeds = select_feeds(config, sys.argv[1:])
+    api = config['api']
+
+    print("Props Worker Started")
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    
-    # Run immediately on startup
-    run_fetch_script()
-    
-    # Then run every hour
+    for feed in feeds:
+        print(f"  - {feed['name']}: {feed['sport']} {feed['report_id']}/{feed['view']} "
+              f"every {feed['interval_minutes']} min")
+
+    session = create_session()
+    spaces_client = create_spaces_client(feeds)
+    key_limiter = RateLimiter(api['max_requests_per_minute'], 60)
+    states = [FeedState(feed, uploads_enabled=spaces_client is not None) for feed in feeds]
+    write_status(states, config['status_file'])
+
     while True:
-        print(f"\nSleeping for 1 hour... (next run at {datetime.fromtimestamp(time.time() + 3600).strftime('%H:%M:%S')})")
-        time.sleep(3600)  # Sleep for 1 hour
-        run_fetch_script()
+        now = time.time()
+
+        # Optional: Upload to Digital Ocean Spaces if credentials are set.
+        # Uploads don't touch the upstream API, so they skip the rate limits.
+        if spaces_client is not None:
+            uploaded = False
+            for state in states:
+                upload_due = state.upload_due()
+                if upload_due is not None and upload_due <= now:
+                    run_upload(state, spaces_client)
+                    uploaded = True
+            if uploaded:
+                write_status(states, config['status_file'])
+                continue
+
+        # Next feed to run: the earliest due time, pushed back by its own limit
+        ready_at, state = min(
+            ((max(state.next_due(), now + state.limiter.wait_time(now)), state) for state in states),
+            key=lambda item: item[0]
+        )
+        wait = max(ready_at - now, key_limiter.wait_time(now))
+        next_run = state.feed['name']
+
+        # A pending upload retry may come round before the next fetch
+        if spaces_client is not None:
+            for upload_state in states:
+                upload_due = upload_state.upload_due()
+                if upload_due is not None and upload_due - now < wait:
+                    wait = upload_due - now
+                    next_run = f"{upload_state.feed['name']} upload"
+
+        if wait > 0:
+            next_at = datetime.fromtimestamp(now + wait).strftime('%H:%M:%S')
+            print(f"\nSleeping for {int(wait // 60)} min {int(wait % 60)} s... "
+                  f"(next run: {next_run} at {next_at})")
+            time.sleep(wait)
+            continue
+
+        state.limiter.record(now)
+        key_limiter.record(now)
+        run_feed(state, api, session)
+        write_status(states, config['status_file'])
 
 
 if __name__ == "__main__":
@@ -83,4 +160,3 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"Worker crashed: {e}", file=sys.stderr)
         sys.exit(1)
-